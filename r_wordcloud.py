@@ -16,8 +16,14 @@ Usage:
     img = wordcloud(freqs, palette="Dark2", scale=(4, 0.5), rot_per=0.1)
 """
 
+import functools
+import heapq
 import math
 import random
+import re
+from collections import Counter, OrderedDict, defaultdict
+from itertools import islice
+from operator import itemgetter
 from typing import Optional, Union
 from PIL import Image, ImageDraw, ImageFont
 
@@ -49,12 +55,54 @@ BREWER_PALETTES = {
     "Spectral": ["#D53E4F", "#F46D43", "#FDAE61", "#FEE08B", "#E6F598", "#ABDDA4", "#66C2A5", "#3288BD"],
 }
 
+# Loaded fonts, keyed by (font_path, size). Parsing a TTF is by far the most
+# expensive step of a render, so each face/size pair is only loaded once.
+_FONT_CACHE = {}
+
+# Text bounding boxes, keyed by (id(font), word), in LRU order. Fonts live in
+# _FONT_CACHE for the life of the process, so their ids are stable cache keys.
+_BBOX_CACHE = OrderedDict()
+_BBOX_CACHE_SIZE = 4096
+
+# Cell size of the overlap grid as a fraction of the canvas, roughly a typical word width
+_GRID_CELL = 0.05
+
+# Rendered word coverage masks, keyed by (id(font), word, rotated), in LRU order
+_GLYPH_CACHE = OrderedDict()
+_GLYPH_CACHE_SIZE = 512
+_GLYPH_PAD = 2
+
+# Lossless 90 degree rotation (Image.Transpose needs Pillow >= 9.1)
+_ROTATE_90 = getattr(Image, "Transpose", Image).ROTATE_90
+
 # Characters with descenders (the R code's "mind your ps and qs")
 TAILS = set("gjpqy")
+_TAILS_ANY_CASE = frozenset(TAILS | {c.upper() for c in TAILS})
 
 
+@functools.lru_cache(maxsize=4096)
 def _has_tails(word: str) -> bool:
-    return any(c in TAILS for c in word.lower())
+    return not _TAILS_ANY_CASE.isdisjoint(word)
+
+
+def _get_font(font_path: Optional[str], size: int):
+    """Load a font at the given pixel size, falling back to common system fonts, then Pillow's default."""
+    key = (font_path or "_default_", size)
+    font = _FONT_CACHE.get(key)
+    if font is not None:
+        return font
+    try:
+        if font_path:
+            font = ImageFont.truetype(font_path, size)
+        else:
+            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+    except (OSError, IOError):
+        try:
+            font = ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", size)
+        except (OSError, IOError):
+            font = ImageFont.load_default()
+    _FONT_CACHE[key] = font
+    return font
 
 
 def _get_palette_colors(palette: Union[str, list], skip_light: int = 2) -> list:
@@ -82,41 +130,252 @@ def _hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
 
 
+# Built-in palettes as RGB tuples, exactly as _get_palette_colors() returns them
+_BREWER_RGB = {
+    name: tuple(_hex_to_rgb(c) for c in _get_palette_colors(name))
+    for name in BREWER_PALETTES
+}
+
+
+def _text_bbox(draw, word, font):
+    """Return draw.textbbox((0, 0), word, font=font), memoized per font and word."""
+    key = (id(font), word)
+    try:
+        _BBOX_CACHE.move_to_end(key)
+        return _BBOX_CACHE[key]
+    except KeyError:
+        pass
+    bbox = _BBOX_CACHE[key] = draw.textbbox((0, 0), word, font=font)
+    if len(_BBOX_CACHE) > _BBOX_CACHE_SIZE:
+        _BBOX_CACHE.popitem(last=False)
+    return bbox
+
+
 def _measure_text(draw, word, font):
     """Measure text bounding box, returns (width, height).
     
     Uses textbbox which returns (left, top, right, bottom).
     Offsets can be non-zero (e.g. negative top for ascenders).
     """
-    bbox = draw.textbbox((0, 0), word, font=font)
+    bbox = _text_bbox(draw, word, font)
     return bbox[2] - bbox[0], bbox[3] - bbox[1]
 
 
 def _get_text_offset(draw, word, font):
     """Get the (left, top) offset from textbbox — needed for precise drawing."""
-    bbox = draw.textbbox((0, 0), word, font=font)
+    bbox = _text_bbox(draw, word, font)
     return bbox[0], bbox[1]
 
 
-def _is_overlap(x1, y1, w1, h1, boxes):
-    """Check if box (x1, y1, w1, h1) overlaps any box in the list.
+class _Scratch:
+    """Reusable "L" canvas for rasterizing glyph masks.
     
-    Direct port of the C++ is_overlap from layout.cpp.
+    Grows to the largest glyph requested so far; each request only clears the
+    region it needs instead of allocating a fresh image and ImageDraw.
     """
-    for (x2, y2, w2, h2) in boxes:
-        if x1 < x2:
-            ov_x = (x1 + w1) > x2
-        else:
-            ov_x = (x2 + w2) > x1
-        
-        if y1 < y2:
-            ov = ov_x and ((y1 + h1) > y2)
+    
+    def __init__(self):
+        self.img = None
+        self.draw = None
+    
+    def canvas(self, w, h):
+        """Return an ImageDraw over the scratch image with (0, 0, w, h) cleared."""
+        img = self.img
+        if img is None or w > img.width or h > img.height:
+            if img is not None:
+                w, h = max(w, img.width), max(h, img.height)
+            self.img = Image.new("L", (w, h), 0)
+            self.draw = ImageDraw.Draw(self.img)
         else:
-            ov = ov_x and ((y2 + h2) > y1)
-        
-        if ov:
-            return True
-    return False
+            img.paste(0, (0, 0, w, h))
+        return self.draw
+
+
+def _render_glyph(draw, word, font, rotated, scratch):
+    """Rasterize a word into an "L" coverage mask, memoized.
+    
+    Returns (mask, dx, dy) where (dx, dy) is the paste offset of the mask's
+    top-left corner relative to the word's center. Words are opaque, so they
+    are drawn by pasting a solid color through the mask, which skips RGBA
+    blending and lets one mask serve every color. Recently used masks are
+    kept in _GLYPH_CACHE; misses are drawn on the shared _Scratch canvas and
+    cropped out of it.
+    """
+    key = (id(font), word, rotated)
+    try:
+        _GLYPH_CACHE.move_to_end(key)
+        return _GLYPH_CACHE[key]
+    except KeyError:
+        pass
+    
+    # Blank canvas with a little padding around the glyph's bounding box
+    tw_px, th_px = _measure_text(draw, word, font)
+    ox, oy = _get_text_offset(draw, word, font)
+    pad = _GLYPH_PAD
+    tmp_w = tw_px + pad * 2
+    tmp_h = th_px + pad * 2
+    scratch.canvas(tmp_w, tmp_h).text((pad - ox, pad - oy), word, font=font, fill=255)
+    mask = scratch.img.crop((0, 0, tmp_w, tmp_h))
+    if rotated:
+        mask = mask.transpose(_ROTATE_90)
+        entry = (mask, -(mask.width // 2), -(mask.height // 2))
+    else:
+        entry = (mask, -(tw_px // 2) - pad, -(th_px // 2) - pad)
+    
+    _GLYPH_CACHE[key] = entry
+    if len(_GLYPH_CACHE) > _GLYPH_CACHE_SIZE:
+        _GLYPH_CACHE.popitem(last=False)
+    return entry
+
+
+def _is_overlap(x1, y1, w1, h1, boxes):
+    """Return the first box in the list that box (x1, y1, w1, h1) overlaps, or None.
+    
+    Boxes are stored by their edges as (left, top, right, bottom). For
+    non-negative sizes this is equivalent to the C++ is_overlap from
+    layout.cpp, but needs no branching on which box comes first.
+    """
+    r1 = x1 + w1
+    b1 = y1 + h1
+    for box in boxes:
+        l2, t2, r2, b2 = box
+        if x1 < r2 and l2 < r1 and y1 < b2 and t2 < b1:
+            return box
+    return None
+
+
+def _sample_weighted(words_freqs: list, k: int, rng: random.Random) -> list:
+    """Pick k distinct (word, freq) pairs with probability proportional to freq.
+    
+    Efraimidis-Spirakis sampling without replacement, with keys taken in log
+    space (Exp(f) draws, smallest wins) so they stay distinct for any weight
+    size; the sample keeps the input's (frequency) order.
+    """
+    keyed = [
+        (rng.expovariate(f) if f > 0 else math.inf, i)
+        for i, (w, f) in enumerate(words_freqs)
+    ]
+    picked = sorted(i for _, i in heapq.nsmallest(k, keyed))
+    return [words_freqs[i] for i in picked]
+
+
+class _Grid:
+    """Uniform grid spatial hash over placed boxes.
+    
+    Each box is registered in every cell it touches, so an overlap query only
+    has to test the boxes sharing a cell with the candidate instead of all of them.
+    """
+    
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.cells = defaultdict(list)
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def _span(self, lo, size):
+        c = self.cell
+        return range(int(lo // c), int((lo + size) // c) + 1)
+    
+    def add(self, x, y, w, h):
+        box = (x, y, x + w, y + h)
+        self.count += 1
+        for ix in self._span(x, w):
+            for iy in self._span(y, h):
+                self.cells[ix, iy].append(box)
+    
+    def overlaps(self, x, y, w, h):
+        """Return a placed box overlapping (x, y, w, h), or None."""
+        # Called once per spiral probe, so the cell span is inlined here.
+        c = self.cell
+        cells = self.cells
+        iy0 = int(y // c)
+        iy1 = int((y + h) // c) + 1
+        for ix in range(int(x // c), int((x + w) // c) + 1):
+            for iy in range(iy0, iy1):
+                boxes = cells.get((ix, iy))
+                # A box spanning several cells may be tested more than once; that
+                # is cheaper than de-duplicating candidates on every probe.
+                if boxes:
+                    hit = _is_overlap(x, y, w, h, boxes)
+                    if hit is not None:
+                        return hit
+        return None
+
+
+@functools.lru_cache(maxsize=8)
+def _spiral(theta_step: float, r_step: float) -> tuple:
+    """Offsets (r*cos(theta), r*sin(theta)) of each Archimedean spiral step.
+    
+    The spiral is the same for every word up to its random starting angle,
+    so it is tabulated once per (theta_step, r_step); only the few most
+    recently used tables are kept, since small steps make them large. It ends
+    at the first step past the corner of the unit square, where no word can fit.
+    Returns (table, dr); step k lies at radius k * dr.
+    """
+    dr = r_step * theta_step / (2 * math.pi)
+    if dr <= 0:
+        raise ValueError("theta_step and r_step must be positive")
+    r_limit = math.sqrt(0.5)
+    table = []
+    k = 0
+    while True:
+        r = k * dr
+        table.append((r * math.cos(k * theta_step), r * math.sin(k * theta_step)))
+        if r > r_limit:
+            break
+        k += 1
+    return tuple(table), dr
+
+
+def _place(tw, th, theta, spiral, dr, boxes, width, height):
+    """Walk the spiral, rotated by theta, from the center until a (tw, th) box fits.
+    
+    The spiral is defined on the unit square like R's and scaled to the canvas
+    here; boxes and bounds are in integer pixels. Returns the (x, y) center in
+    pixels, or None if the spiral leaves the canvas first. This is the hot loop
+    of the layout; each step is a table lookup rotated by the angle-addition
+    formulas.
+    
+    The walk stops at the farthest radius where the box can still lie inside
+    the canvas (its center in the corner of the allowed region), so large
+    words that don't fit give up early.
+    """
+    c0, s0 = math.cos(theta), math.sin(theta)
+    cw, sw = c0 * width, s0 * width
+    ch, sh = c0 * height, s0 * height
+    cx, cy = 0.5 * width, 0.5 * height
+    overlaps = boxes.overlaps
+    half_w, half_h = tw // 2, th // 2
+    max_bx, max_by = width - tw, height - th
+    # Nothing placed yet: the first in-bounds probe wins
+    empty = len(boxes) == 0
+    # Consecutive probes are close together, so the box that blocked the last
+    # one usually blocks the next; test it before going to the grid
+    blocker = None
+    # One pixel of slack covers truncation of the probe center
+    r_max = math.hypot(0.5 - (half_w - 1) / width, 0.5 - (half_h - 1) / height)
+    
+    for rc, rs in islice(spiral, int(r_max / dr) + 2):
+        px = int(cx + rc * cw - rs * sw)
+        bx = px - half_w
+        if bx < 0 or bx > max_bx:
+            continue
+        py = int(cy + rs * ch + rc * sh)
+        by = py - half_h
+        if by < 0 or by > max_by:
+            continue
+        if empty:
+            return px, py
+        if blocker is not None:
+            l2, t2, r2, b2 = blocker
+            if bx < r2 and l2 < bx + tw and by < b2 and t2 < by + th:
+                continue
+        blocker = overlaps(bx, by, tw, th)
+        if blocker is None:
+            return px, py
+    return None
 
 
 def wordcloud(
@@ -126,6 +385,7 @@ def wordcloud(
     scale: tuple = (4, 0.5),
     min_freq: int = 1,
     max_words: int = 200,
+    sample_tail: int = 0,
     random_order: bool = False,
     random_color: bool = False,
     rot_per: float = 0.1,
@@ -148,6 +408,10 @@ def wordcloud(
             The R default is (4, 0.5). Higher first value = bigger max word.
         min_freq: Minimum frequency to include a word.
         max_words: Maximum number of words to display.
+        sample_tail: If > 0 and there are more than max_words words, keep the
+            top sample_tail words and fill the rest of max_words with a random
+            sample of the remaining words, weighted by frequency. 0 = keep the
+            top max_words.
         random_order: If True, place words in random order; if False, by frequency.
         random_color: If True, assign colors randomly; if False, map to frequency.
         rot_per: Proportion of words to rotate 90 degrees (0.0 to 1.0).
@@ -158,160 +422,141 @@ def wordcloud(
         theta_step: Angular step for spiral (R default: 0.1).
         r_step: Radial step for spiral (R default: 0.05).
         margin: Pixel margin added around each word's bounding box.
-        seed: Random seed for reproducibility.
+        seed: Random seed for reproducibility. None = a new layout each call.
         
     Returns:
         PIL Image object.
     """
-    if seed is not None:
-        random.seed(seed)
+    # Private generator: seeded runs are reproducible regardless of other users
+    # of the random module, and draws skip the shared global instance
+    rng = random.Random(seed)
     
     # Get colors
-    colors = _get_palette_colors(palette)
-    nc = len(colors)
-    rgb_colors = [_hex_to_rgb(c) for c in colors]
+    if isinstance(palette, str) and palette in _BREWER_RGB:
+        rgb_colors = _BREWER_RGB[palette]
+    else:
+        rgb_colors = [_hex_to_rgb(c) for c in _get_palette_colors(palette)]
+    nc = len(rgb_colors)
     
     # Filter and sort words
     words_freqs = [(w, f) for w, f in frequencies.items() if f >= min_freq]
-    words_freqs.sort(key=lambda x: x[1], reverse=True)
-    words_freqs = words_freqs[:max_words]
+    if 0 < sample_tail < max_words < len(words_freqs):
+        words_freqs.sort(key=itemgetter(1), reverse=True)
+        words_freqs = words_freqs[:sample_tail] + _sample_weighted(
+            words_freqs[sample_tail:], max_words - sample_tail, rng)
+    else:
+        # Same as a stable sort + slice, without sorting the whole vocabulary
+        words_freqs = heapq.nlargest(max_words, words_freqs, key=itemgetter(1))
     
     if not words_freqs:
         img = Image.new("RGB", (width, height), background_color)
         return img
+    max_freq = words_freqs[0][1]
     
     # Order: by frequency (descending) or random
     if random_order:
-        random.shuffle(words_freqs)
+        rng.shuffle(words_freqs)
     # else: already sorted by frequency desc
     
-    words = [w for w, f in words_freqs]
-    freqs = [f for w, f in words_freqs]
-    max_freq = max(freqs)
-    normed_freq = [f / max_freq for f in freqs]
-    
-    # Compute cex (character expansion) sizes - maps frequency to font scale
-    # size = (scale[0] - scale[1]) * normedFreq + scale[1]
-    cex_values = [(scale[0] - scale[1]) * nf + scale[1] for nf in normed_freq]
+    # Normalize frequencies and compute cex (character expansion) sizes, which
+    # map frequency to font scale: size = (scale[0] - scale[1]) * normedFreq + scale[1]
+    words, normed_freq, cex_values = [], [], []
+    cex_range, cex_min = scale[0] - scale[1], scale[1]
+    for w, f in words_freqs:
+        nf = f / max_freq
+        words.append(w)
+        normed_freq.append(nf)
+        cex_values.append(cex_range * nf + cex_min)
     
     # Create image and drawing context
     img = Image.new("RGB", (width, height), background_color)
     draw = ImageDraw.Draw(img)
     
-    # Load fonts at different sizes
-    def get_font(cex):
-        size = max(1, int(base_font_size * cex))
-        try:
-            if font_path:
-                return ImageFont.truetype(font_path, size)
-            else:
-                return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
-        except (OSError, IOError):
-            try:
-                return ImageFont.truetype("/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf", size)
-            except (OSError, IOError):
-                return ImageFont.load_default()
-    
-    # Place words using Archimedean spiral
-    # Working in normalized coordinates [0, 1] like R, then scale to pixels
-    boxes = []  # List of (x, y, w, h) in normalized coords
-    placed = []  # List of (word, x_px, y_px, font, rotated, color_rgb)
+    # Load fonts at different sizes (one load per distinct size)
+    fonts = [_get_font(font_path, max(1, int(base_font_size * cex))) for cex in cex_values]
     
-    for i, word in enumerate(words):
-        cex = cex_values[i]
-        font = get_font(cex)
-        
-        # Measure text in pixels, convert to normalized coords
+    # Measure every word up front, in integer pixels with margin
+    sizes = []
+    for word, font in zip(words, fonts):
         tw_px, th_px = _measure_text(draw, word, font)
         tw_px += margin * 2
         th_px += margin * 2
-        
         # Descender compensation ("mind your ps and qs")
         if _has_tails(word):
             th_px = int(th_px + th_px * 0.2)
+        sizes.append((tw_px, th_px))
+    
+    # Frequency-mapped colors; high frequency = first color in palette
+    freq_colors = []
+    for nf in normed_freq:
+        ci = max(0, min(int(math.ceil(nc * nf)), nc) - 1)
+        freq_colors.append(rgb_colors[nc - 1 - ci])
+    
+    # Place words using Archimedean spiral
+    boxes = _Grid(max(1, round(_GRID_CELL * max(width, height))))  # Placed word boxes in pixels
+    placed = []  # List of (word, x_px, y_px, font, rotated, color_rgb)
+    spiral, dr = _spiral(theta_step, r_step)
+    
+    for i, word in enumerate(words):
+        tw, th = sizes[i]
         
-        # Normalized dimensions
-        wid = tw_px / width
-        ht = th_px / height
-        
-        # Handle rotation
-        rot_word = random.random() < rot_per
+        # Handle rotation. Sizes are in pixels, so swapping them is exact on any
+        # canvas; swapping normalized sizes was only right on square ones.
+        rot_word = rng.random() < rot_per
         if rot_word:
-            wid, ht = ht, wid
+            tw, th = th, tw
         
         # Spiral placement
-        r = 0.0
-        theta = random.uniform(0, 2 * math.pi)
-        placed_ok = False
+        theta = rng.uniform(0, 2 * math.pi)
+        pos = _place(tw, th, theta, spiral, dr, boxes, width, height)
+        if pos is None:
+            # Word doesn't fit
+            continue
+        px, py = pos
+        
+        # Determine color
+        if random_color:
+            cc = rgb_colors[rng.randint(0, nc - 1)]
+        else:
+            cc = freq_colors[i]
         
-        while True:
-            x1 = 0.5 + r * math.cos(theta)
-            y1 = 0.5 + r * math.sin(theta)
-            
-            bx = x1 - 0.5 * wid
-            by = y1 - 0.5 * ht
-            
-            # Check bounds and overlap
-            if (bx > 0 and by > 0 and 
-                bx + wid < 1 and by + ht < 1 and
-                not _is_overlap(bx, by, wid, ht, boxes)):
-                
-                # Determine color
-                if random_color:
-                    cc = rgb_colors[random.randint(0, nc - 1)]
-                else:
-                    ci = min(int(math.ceil(nc * normed_freq[i])), nc) - 1
-                    ci = max(0, ci)
-                    # Reverse so that high frequency = first color in palette
-                    cc = rgb_colors[nc - 1 - ci]
-                
-                # Convert to pixel coords
-                px = int(x1 * width)
-                py = int(y1 * height)
-                
-                placed.append((word, px, py, font, rot_word, cc))
-                boxes.append((bx, by, wid, ht))
-                placed_ok = True
-                break
-            
-            # Spiral outward
-            if r > math.sqrt(0.5):
-                # Word doesn't fit
-                break
-            
-            theta += theta_step
-            r += r_step * theta_step / (2 * math.pi)
+        placed.append((word, px, py, fonts[i], rot_word, cc))
+        boxes.add(px - tw // 2, py - th // 2, tw, th)
     
     # Render all placed words
+    scratch = _Scratch()
     for (word, px, py, font, rotated, color) in placed:
-        if rotated:
-            # Create temporary image for rotated text with generous padding
-            tw_px, th_px = _measure_text(draw, word, font)
-            ox, oy = _get_text_offset(draw, word, font)
-            pad = max(4, int(th_px * 0.3))  # generous padding for glyphs
-            tmp_w = tw_px + pad * 2
-            tmp_h = th_px + pad * 2
-            txt_img = Image.new("RGBA", (tmp_w, tmp_h), (0, 0, 0, 0))
-            txt_draw = ImageDraw.Draw(txt_img)
-            txt_draw.text((pad - ox, pad - oy), word, font=font, fill=color + (255,))
-            txt_img = txt_img.rotate(90, expand=True)
-            # Paste centered at position
-            paste_x = px - txt_img.width // 2
-            paste_y = py - txt_img.height // 2
-            img.paste(txt_img, (paste_x, paste_y), txt_img)
-        else:
-            tw_px, th_px = _measure_text(draw, word, font)
-            ox, oy = _get_text_offset(draw, word, font)
-            draw.text(
-                (px - tw_px // 2 - ox, py - th_px // 2 - oy),
-                word, font=font, fill=color
-            )
+        mask, dx, dy = _render_glyph(draw, word, font, rotated, scratch)
+        img.paste(color, (px + dx, py + dy), mask)
     
     return img
 
 
 # --- Convenience functions ---
 
+_TOKEN_RE = re.compile(r'[a-z]+')
+
+# Basic English stopwords
+_DEFAULT_STOPWORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
+    "for", "of", "with", "by", "from", "is", "was", "are", "were",
+    "be", "been", "being", "have", "has", "had", "do", "does", "did",
+    "will", "would", "could", "should", "may", "might", "shall",
+    "can", "need", "dare", "ought", "used", "it", "its", "this",
+    "that", "these", "those", "i", "me", "my", "we", "our", "you",
+    "your", "he", "him", "his", "she", "her", "they", "them", "their",
+    "what", "which", "who", "whom", "where", "when", "how", "not",
+    "no", "nor", "as", "if", "then", "than", "so", "just", "also",
+    "about", "up", "out", "into", "over", "after", "before", "between",
+    "through", "during", "all", "each", "every", "both", "few",
+    "more", "most", "other", "some", "such", "only", "own", "same",
+    "very", "s", "t", "will", "don", "now", "d", "m", "o", "re",
+    "ve", "y", "ain", "aren", "couldn", "didn", "doesn", "hadn",
+    "hasn", "haven", "isn", "ma", "mightn", "mustn", "needn",
+    "shan", "shouldn", "wasn", "weren", "won", "wouldn",
+})
+
+
 def wordcloud_from_text(
     text: str,
     stopwords: Optional[set] = None,
@@ -321,37 +566,16 @@ def wordcloud_from_text(
     
     Tokenizes, removes stopwords, counts frequencies, then calls wordcloud().
     """
-    import re
-    
     if stopwords is None:
-        # Basic English stopwords
-        stopwords = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to",
-            "for", "of", "with", "by", "from", "is", "was", "are", "were",
-            "be", "been", "being", "have", "has", "had", "do", "does", "did",
-            "will", "would", "could", "should", "may", "might", "shall",
-            "can", "need", "dare", "ought", "used", "it", "its", "this",
-            "that", "these", "those", "i", "me", "my", "we", "our", "you",
-            "your", "he", "him", "his", "she", "her", "they", "them", "their",
-            "what", "which", "who", "whom", "where", "when", "how", "not",
-            "no", "nor", "as", "if", "then", "than", "so", "just", "also",
-            "about", "up", "out", "into", "over", "after", "before", "between",
-            "through", "during", "all", "each", "every", "both", "few",
-            "more", "most", "other", "some", "such", "only", "own", "same",
-            "very", "s", "t", "will", "don", "now", "d", "m", "o", "re",
-            "ve", "y", "ain", "aren", "couldn", "didn", "doesn", "hadn",
-            "hasn", "haven", "isn", "ma", "mightn", "mustn", "needn",
-            "shan", "shouldn", "wasn", "weren", "won", "wouldn",
-        }
-    
-    # Tokenize
-    words_raw = re.findall(r'[a-zA-Z]+', text.lower())
-    words_filtered = [w for w in words_raw if w not in stopwords and len(w) > 1]
-    
-    # Count frequencies
-    freq = {}
-    for w in words_filtered:
-        freq[w] = freq.get(w, 0) + 1
+        stopwords = _DEFAULT_STOPWORDS
+    else:
+        stopwords = frozenset(stopwords)
+    
+    # Tokenize and count frequencies
+    freq = Counter(
+        w for w in _TOKEN_RE.findall(text.lower())
+        if len(w) > 1 and w not in stopwords
+    )
     
     return wordcloud(freq, **kwargs)
 